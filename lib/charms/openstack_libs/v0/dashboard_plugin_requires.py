@@ -58,7 +58,7 @@ installed to. The plugin charm can access these values as attributes on the
 `HorizonPlugin` object.
 
     ...
-    logger.debug(f'Current release is {self.plugin.release}')
+    logger.debug('Current release is %s', self.plugin.release)
     ...
 
 Note, these values are only returned when the relation between plugin charm
@@ -67,12 +67,18 @@ principal charm.
 """
 import json
 import logging
-from typing import List, Optional
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
 
 import ops.charm
 from ops.framework import EventBase, EventSource, Object, ObjectEvents
 from ops.model import Relation
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # The unique Charmhub library identifier, never change it
 LIBID = "9317847810c341a1ad80895b5d206b85"
 
@@ -81,11 +87,55 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 1
+LIBPATCH = 2
 
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(value) -> str:
+    """Serialise the value into a JSON string with sorted keys.
+
+    orjson is used when it is available, otherwise the stdlib json module
+    is used with the same compact output, leaving non-ASCII characters
+    unescaped as orjson does, so the relation data is identical regardless
+    of the encoder.
+
+    :param value: the value to serialise
+    :return: the JSON encoded value
+    :rtype: str
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def _format_priority(priority: Optional[Union[int, str]]) -> Optional[str]:
+    """Validate the plugin priority and format it for the relation data.
+
+    Integers are accepted, as are strings holding an integer for backwards
+    compatibility with callers which passed the priority as a string. None
+    and the empty string mean that no priority is set.
+
+    :param priority: the priority of the plugin
+    :type priority: Optional[Union[int, str]]
+    :return: the priority as a string, or None if no priority is set
+    :rtype: Optional[str]
+    :raises ValueError: if the priority is not an integer
+    """
+    if priority is None or priority == "":
+        return None
+    if isinstance(priority, int) and not isinstance(priority, bool):
+        return str(priority)
+    if isinstance(priority, str):
+        try:
+            return str(int(priority))
+        except ValueError:
+            pass
+    raise ValueError("priority must be an integer, got {!r}".format(priority))
+
+
 class HorizonConnectedEvent(EventBase):
     """Raised when the OpenStack Horizon Dashboard is connected."""
 
@@ -128,8 +178,10 @@ class HorizonPlugin(Object):
         install_packages: List[str] = None,
         conflicting_packages: Optional[List[str]] = None,
         local_settings: str = "",
-        priority: str = None,
+        priority: Optional[Union[int, str]] = None,
     ):
+        # Fail when the plugin is created rather than when the relation joins
+        _format_priority(priority)
         super().__init__(charm, relation_name)
         self.charm = charm
         self.relation_name = relation_name
@@ -137,17 +189,29 @@ class HorizonPlugin(Object):
         self.conflicting_packages = conflicting_packages
         self.local_settings = local_settings
         self.priority = priority
+        # Encoded package lists keyed by their contents, so that the lists
+        # given here are only encoded once however often they are published.
+        self._packages_json: Dict[Tuple[str, ...], str] = {}
+        for packages in (install_packages, conflicting_packages):
+            if packages:
+                self._encode_packages(packages)
+        # Remote data read during this hook; dropped on any relation event.
+        self._remote_cache: Dict[str, Optional[str]] = {}
 
         self.framework.observe(
-            self.charm.on[relation_name].relation_joined,
+            charm.on[relation_name].relation_joined,
             self._on_dashboard_relation_joined,
         )
         self.framework.observe(
-            self.charm.on[relation_name].relation_changed,
+            charm.on[relation_name].relation_changed,
             self._on_dashboard_relation_changed,
         )
         self.framework.observe(
-            self.charm.on[relation_name].relation_broken,
+            charm.on[relation_name].relation_departed,
+            self._on_dashboard_relation_departed,
+        )
+        self.framework.observe(
+            charm.on[relation_name].relation_broken,
             self._on_dashboard_relation_broken,
         )
 
@@ -161,7 +225,8 @@ class HorizonPlugin(Object):
         :type event: EventBase
         :return: None
         """
-        logging.debug(f"{self.relation_name} relation has joined")
+        logger.debug("%s relation has joined", self.relation_name)
+        self._reset_relation_cache()
         self.publish_plugin_info(
             self.local_settings,
             self.priority,
@@ -177,9 +242,23 @@ class HorizonPlugin(Object):
         When the dashboard relation changes, it may be indicating that there's
         a new OpenStack release or that some other element has changed.
         """
-        logging.debug(f"{self.relation_name} relation has changed")
+        logger.debug("%s relation has changed", self.relation_name)
+        self._remote_cache.clear()
         self.on.available.emit()
 
+    def _on_dashboard_relation_departed(self, event: EventBase):
+        """Handles relation departed events for the dashboard relation.
+
+        A departed unit may have provided the cached remote data, so the
+        cached values are dropped.
+
+        :param event: the event
+        :type event: EventBase
+        :return: None
+        """
+        logger.debug("%s unit has departed", self.relation_name)
+        self._reset_relation_cache()
+
     def _on_dashboard_relation_broken(self, event: EventBase):
         """Handles relation departed events for the dashboard relation.
 
@@ -190,18 +269,32 @@ class HorizonPlugin(Object):
         :type event: EventBase
         return: None
         """
-        logging.debug(f"{self.relation_name} relation has departed")
+        logger.debug("%s relation has departed", self.relation_name)
+        self._reset_relation_cache()
         self.on.goneaway.emit()
 
-    @property
+    def _reset_relation_cache(self) -> None:
+        """Drop the cached relation and remote data after a membership change.
+
+        :return: None
+        """
+        self.__dict__.pop("_relation", None)
+        self._remote_cache.clear()
+
+    @cached_property
     def _relation(self) -> Relation:
-        """The shared-db relation."""
+        """The dashboard relation.
+
+        The lookup is cached for the lifetime of this object, which is a
+        single hook invocation. Relation joined, departed and broken events
+        reset the cached value.
+        """
         return self.framework.model.get_relation(self.relation_name)
 
     def publish_plugin_info(
         self,
         local_settings: str,
-        priority: str,
+        priority: Optional[Union[int, str]],
         install_packages: Optional[List[str]] = None,
         conflicting_packages: Optional[List[str]] = None,
         relation: Optional[Relation] = None,
@@ -218,6 +311,7 @@ class HorizonPlugin(Object):
         :type local_settings: str
         :param priority: Value used by the principal charm to order the
             configuration blobs when multiple plugin subordinates are present
+        :type priority: Optional[Union[int, str]]
         :param install_packages: a list of packages that should be installed
             for this plugin
         :type install_packages: Optional[List[str]]
@@ -234,16 +328,47 @@ class HorizonPlugin(Object):
         if not rel:
             return
 
-        data = rel.data[self.charm.unit]
-        data["local-settings"] = local_settings
-        if priority:
-            data["priority"] = priority
+        # Every key written to the databag results in a relation-set call,
+        # so build the payload first and only write the keys which differ
+        # from what has already been published.
+        payload = {"local-settings": local_settings}
+        priority = _format_priority(priority)
+        if priority is not None:
+            payload["priority"] = priority
         if install_packages:
-            data["install-packages"] = json.dumps(install_packages)
+            payload["install-packages"] = self._encode_packages(
+                install_packages
+            )
         if conflicting_packages:
-            data["conflicting-packages"] = json.dumps(conflicting_packages)
-
-        rel.data[self.charm.unit].update(data)
+            payload["conflicting-packages"] = self._encode_packages(
+                conflicting_packages
+            )
+
+        data = rel.data[self.model.unit]
+        changed = {
+            key: value
+            for key, value in payload.items()
+            # Juju drops keys set to an empty string from the databag
+            if data.get(key, "") != value
+        }
+        if changed:
+            data.update(changed)
+
+    def _encode_packages(self, packages: List[str]) -> str:
+        """Returns the JSON encoding of a list of packages.
+
+        The encoding is cached by the contents of the list, so a list which
+        has been changed since it was last encoded is encoded again.
+
+        :param packages: the list of packages to encode
+        :type packages: List[str]
+        :return: the JSON encoded list
+        :rtype: str
+        """
+        key = tuple(packages)
+        if key not in self._packages_json:
+            self._packages_json[key] = _json_dumps(packages)
+        return self._packages_json[key]
 
     def _get_remote_data(self, key: str) -> Optional[str]:
         """Returns the value for the given key from the relation data.
@@ -251,11 +376,26 @@ class HorizonPlugin(Object):
         As long as *one* of the related units can provide the requested data,
         then that data is returned.
 
+        The value is cached so that subsequent reads of the same key within
+        the hook do not iterate over the related units again.
+
         :param key: the key of the value to retrieve from the relation.
         :type key: str
         :return: the value of the relation data
         :rtype: Optional[str]
         """
+        if key not in self._remote_cache:
+            self._remote_cache[key] = self._find_remote_data(key)
+        return self._remote_cache[key]
+
+    def _find_remote_data(self, key: str) -> Optional[str]:
+        """Looks up the value for the given key in the related units' data.
+
+        :param key: the key of the value to retrieve from the relation.
+        :type key: str
+        :return: the value from the first unit providing it
+        :rtype: Optional[str]
+        """
         relation = self._relation
         if not relation:
             return None
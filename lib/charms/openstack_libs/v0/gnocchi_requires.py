@@ -88,9 +88,13 @@ class GnochiClientCharm(CharmBase):
 """
 
 import logging
+from functools import cached_property
+from typing import Optional, Tuple
 
 from ops.framework import EventBase, EventSource, Object, ObjectEvents
-from ops.model import Relation
+from ops.model import Relation, Unit
+
+logger = logging.getLogger(__name__)
 
 # The unique Charmhub library identifier, never change it
 LIBID = "bdc4aef454524b6eaa90501b3c9d500c"
@@ -100,7 +104,7 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 1
+LIBPATCH = 2
 
 
 class GnocchiConnectedEvent(EventBase):
@@ -140,57 +144,84 @@ class GnocchiRequires(Object):
         self.relation_name = relation_name
 
         self.framework.observe(
-            self.charm.on[relation_name].relation_joined,
+            charm.on[relation_name].relation_joined,
             self._on_gnocchi_relation_joined,
         )
         self.framework.observe(
-            self.charm.on[relation_name].relation_changed,
+            charm.on[relation_name].relation_changed,
             self._on_gnocchi_relation_changed,
         )
         self.framework.observe(
-            self.charm.on[relation_name].relation_departed,
-            self._on_gnocchi_relation_changed,
+            charm.on[relation_name].relation_departed,
+            self._on_gnocchi_relation_departed,
         )
         self.framework.observe(
-            self.charm.on[relation_name].relation_broken,
+            charm.on[relation_name].relation_broken,
             self._on_gnocchi_relation_broken,
         )
 
     def _on_gnocchi_relation_joined(self, event):
         """Gnocchi relation joined."""
-        logging.debug("Gnocchi on_joined")
+        logger.debug("Gnocchi on_joined")
+        self._reset_relation_cache()
         self.on.connected.emit()
 
     def _on_gnocchi_relation_changed(self, event):
         """Gnocchi relation changed."""
-        logging.debug("Gnocchi on_changed")
-        try:
-            self.gnocchi_url
+        logger.debug("Gnocchi on_changed")
+        if self.gnocchi_url:
             self.on.ready.emit()
-        except AttributeError:
-            pass
+
+    def _on_gnocchi_relation_departed(self, event):
+        """Gnocchi relation departed."""
+        logger.debug("Gnocchi on_departed")
+        self._reset_relation_cache()
 
     def _on_gnocchi_relation_broken(self, event):
         """Gnocchi relation broken."""
-        logging.debug("Gnocchi on_broken")
+        logger.debug("Gnocchi on_broken")
+        self._reset_relation_cache()
         self.on.goneaway.emit()
 
-    @property
+    def _reset_relation_cache(self) -> None:
+        """Drop the cached relation and units after a membership change."""
+        self.__dict__.pop("_gnocchi_rel", None)
+        self.__dict__.pop("_gnocchi_units", None)
+
+    @cached_property
     def _gnocchi_rel(self) -> Relation:
-        """The Gnocchi relation."""
+        """The Gnocchi relation, resolved once per hook."""
         return self.framework.model.get_relation(self.relation_name)
 
-    def _get_remote_unit_data(self, key: str) -> str:
-        """Return the value for the given key from remote app data."""
-        for unit in self._gnocchi_rel.units:
-            data = self._gnocchi_rel.data[unit]
-            return data.get(key)
+    @cached_property
+    def _gnocchi_units(self) -> Tuple[Unit, ...]:
+        """Snapshot of the remote units on the Gnocchi relation."""
+        relation = self._gnocchi_rel
+        if not relation:
+            return ()
+        return tuple(relation.units)
+
+    def _get_remote_unit_data(self, key: str) -> Optional[str]:
+        """Return the value for the given key from remote unit data.
+
+        The value from the first remote unit which provides it is returned.
+        """
+        relation = self._gnocchi_rel
+        if not relation:
+            return None
+
+        for unit in self._gnocchi_units:
+            value = relation.data[unit].get(key)
+            if value:
+                return value
+
+        return None
 
-    def get_data(self, key: str) -> str:
+    def get_data(self, key: str) -> Optional[str]:
         """Return the value for the given key."""
         return self._get_remote_unit_data(key)
 
     @property
-    def gnocchi_url(self) -> str:
+    def gnocchi_url(self) -> Optional[str]:
         """Return the gnocchi_url."""
         return self.get_data("gnocchi_url")
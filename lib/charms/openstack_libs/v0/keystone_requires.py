@@ -95,6 +95,11 @@ import logging
 from ops.framework import EventBase, EventSource, Object, ObjectEvents
 from ops.model import Relation
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # The unique Charmhub library identifier, never change it
@@ -105,7 +110,21 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 3
+LIBPATCH = 4
+
+
+def _json_dumps(value) -> str:
+    """Return value as a compact JSON string with sorted keys.
+
+    Uses orjson if it is installed and falls back to the stdlib json module,
+    which is told not to escape non-ASCII characters so that it produces the
+    same output either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
 
 
 class KeystoneConnectedEvent(EventBase):
@@ -173,13 +192,13 @@ class KeystoneRequires(Object):
 
     def _on_keystone_relation_joined(self, event):
         """Keystone relation joined."""
-        logging.debug("Keystone on_joined")
+        logger.debug("Keystone on_joined")
         self.on.connected.emit()
         self.register_services(self.service_endpoints, self.region)
 
     def _on_keystone_relation_changed(self, event):
         """Keystone relation changed."""
-        logging.debug("Keystone on_changed")
+        logger.debug("Keystone on_changed")
         try:
             self.service_password
             self.on.ready.emit()
@@ -188,7 +207,7 @@ class KeystoneRequires(Object):
 
     def _on_keystone_relation_broken(self, event):
         """Keystone relation broken."""
-        logging.debug("Keystone on_broken")
+        logger.debug("Keystone on_broken")
         self.on.goneaway.emit()
 
     @property
@@ -372,9 +391,7 @@ class KeystoneRequires(Object):
         # NOTE:
         # Forward compatibility with keystone k8s operator
         if self.model.unit.is_leader():
-            logging.debug("Requesting service registration")
+            logger.debug("Requesting service registration")
             app_data = self._keystone_rel.data[self.charm.app]
-            app_data["service-endpoints"] = json.dumps(
-                service_endpoints, sort_keys=True
-            )
+            app_data["service-endpoints"] = _json_dumps(service_endpoints)
             app_data["region"] = region
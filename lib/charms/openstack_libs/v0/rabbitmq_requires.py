@@ -94,7 +94,7 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 1
+LIBPATCH = 2
 
 
 class RabbitMQConnectedEvent(EventBase):
@@ -154,13 +154,13 @@ class RabbitMQRequires(Object):
 
     def _on_rabbitmq_relation_joined(self, event):
         """Rabbitmq relation joined."""
-        logging.debug("RabbitMQ on_joined")
+        logger.debug("RabbitMQ on_joined")
         self.on.connected.emit()
         self.register()
 
     def _on_rabbitmq_relation_changed(self, event):
         """Rabbitmq relation changed."""
-        logging.debug("RabbitMQ on_changed")
+        logger.debug("RabbitMQ on_changed")
         try:
             self.password
             self.on.ready.emit()
@@ -169,7 +169,7 @@ class RabbitMQRequires(Object):
 
     def _on_rabbitmq_relation_broken(self, event):
         """Rabbitmq relation broken."""
-        logging.debug("RabbitMQ on_broken")
+        logger.debug("RabbitMQ on_broken")
         self.on.goneaway.emit()
 
     @property
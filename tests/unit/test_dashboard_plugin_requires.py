@@ -2,10 +2,13 @@
 # See LICENSE file for licensing details.
 
 import json
-import unittest
+from unittest import mock
 
+import pytest
+from charms.openstack_libs.v0 import dashboard_plugin_requires
 from charms.openstack_libs.v0.dashboard_plugin_requires import HorizonPlugin
 from ops.charm import CharmBase
+from ops.model import RelationDataContent
 from ops.testing import Harness
 
 RELATION_NAME = "dashboard"
@@ -25,7 +28,7 @@ class DashboardPluginCharm(CharmBase):
     def __init__(self, *args):
         super().__init__(*args)
         self.dashboard = HorizonPlugin(
-            self, install_packages=["plugin-foo-ui"]
+            self, install_packages=["plugin-foo-ui"], priority=10
         )
 
         self.framework.observe(
@@ -43,34 +46,186 @@ TEST_UNIT_DATA = {
 }
 
 
-class TestHorizonDashboardPlugin(unittest.TestCase):
-    def setUp(self):
-        self.harness = Harness(DashboardPluginCharm, meta=METADATA)
-        self.addCleanup(self.harness.cleanup)
+def patch_relation_set():
+    """Count writes to relation databags, each of which is a relation-set."""
+    return mock.patch.object(
+        RelationDataContent,
+        "__setitem__",
+        autospec=True,
+        side_effect=RelationDataContent.__setitem__,
+    )
 
-        self.rel_id = self.harness.add_relation(
-            RELATION_NAME, "openstack-dashboard"
+
+@pytest.fixture(scope="class")
+def shared_harness():
+    harness = Harness(DashboardPluginCharm, meta=METADATA)
+    rel_id = harness.add_relation(RELATION_NAME, "openstack-dashboard")
+    harness.add_relation_unit(rel_id, "openstack-dashboard/0")
+    harness.set_leader(True)
+    harness.begin_with_initial_hooks()
+    yield harness
+    harness.cleanup()
+
+
+@pytest.fixture
+def harness(shared_harness):
+    """Yield the class Harness, clearing the dashboard unit data afterwards."""
+    yield shared_harness
+    rel_id = shared_harness.model.get_relation(RELATION_NAME).id
+    data = shared_harness.get_relation_data(rel_id, "openstack-dashboard/0")
+    if data:
+        shared_harness.update_relation_data(
+            rel_id, "openstack-dashboard/0", {key: "" for key in data}
         )
-        self.harness.add_relation_unit(self.rel_id, "openstack-dashboard/0")
-        self.harness.set_leader(True)
-        self.harness.begin_with_initial_hooks()
 
-    def test_register_plugin(self):
+
+@pytest.fixture
+def new_harness():
+    harness = Harness(DashboardPluginCharm, meta=METADATA)
+    yield harness
+    harness.cleanup()
+
+
+@pytest.fixture
+def rel_id(harness):
+    return harness.model.get_relation(RELATION_NAME).id
+
+
+class TestHorizonDashboardPlugin:
+    def test_register_plugin(self, harness):
         """Tests that the relation will register the plugin when connected."""
-        unit_data = self.harness.charm.model.get_relation(RELATION_NAME).data[
-            self.harness.charm.unit
+        unit_data = harness.charm.model.get_relation(RELATION_NAME).data[
+            harness.charm.unit
         ]
-        self.assertEqual(
-            unit_data["install-packages"],
-            json.dumps(["plugin-foo-ui"], sort_keys=True),
-        )
+        assert json.loads(unit_data["install-packages"]) == ["plugin-foo-ui"]
+        assert unit_data["priority"] == "10"
 
-    def test_response_data(self):
+    def test_response_data(self, harness, rel_id):
         """Tests that the plugin will report openstack release, etc."""
-        self.harness.update_relation_data(
-            self.rel_id,
+        harness.update_relation_data(
+            rel_id,
             "openstack-dashboard/0",
             TEST_UNIT_DATA,
         )
         for key, value in TEST_UNIT_DATA.items():
-            self.assertEqual(getattr(self.harness.charm.dashboard, key), value)
+            assert getattr(harness.charm.dashboard, key) == value
+
+    def test_response_data_refreshed(self, harness, rel_id):
+        """Tests that cached values are refreshed when the relation changes."""
+        assert harness.charm.dashboard.release is None
+        harness.update_relation_data(
+            rel_id,
+            "openstack-dashboard/0",
+            TEST_UNIT_DATA,
+        )
+        assert harness.charm.dashboard.release == TEST_UNIT_DATA["release"]
+
+    def test_publish_unchanged(self, harness):
+        """Tests that unchanged plugin info is not written again."""
+        try:
+            with patch_relation_set() as relation_set:
+                harness.charm.dashboard.publish_plugin_info(
+                    "", 10, ["plugin-foo-ui"]
+                )
+                relation_set.assert_not_called()
+
+                harness.charm.dashboard.publish_plugin_info(
+                    "", 20, ["plugin-foo-ui"]
+                )
+                relation_set.assert_called_once()
+        finally:
+            # Restore the data published on joined for the other tests
+            harness.charm.dashboard.publish_plugin_info(
+                "", 10, ["plugin-foo-ui"]
+            )
+
+    def test_publish_writes_each_key_once(self, new_harness):
+        """Tests that relation joined writes each plugin key only once."""
+        rel_id = new_harness.add_relation(RELATION_NAME, "openstack-dashboard")
+        new_harness.add_relation_unit(rel_id, "openstack-dashboard/0")
+        with patch_relation_set() as relation_set:
+            new_harness.begin_with_initial_hooks()
+
+        keys = [call.args[1] for call in relation_set.call_args_list]
+        assert sorted(keys) == ["install-packages", "priority"]
+
+    def test_publish_changed_packages(self, new_harness):
+        """Tests that packages changed before the relation joins are sent."""
+        new_harness.begin()
+        new_harness.charm.dashboard.install_packages.append("plugin-bar-ui")
+        rel_id = new_harness.add_relation(RELATION_NAME, "openstack-dashboard")
+        new_harness.add_relation_unit(rel_id, "openstack-dashboard/0")
+
+        unit_data = new_harness.get_relation_data(
+            rel_id, new_harness.charm.unit.name
+        )
+        assert json.loads(unit_data["install-packages"]) == [
+            "plugin-foo-ui",
+            "plugin-bar-ui",
+        ]
+
+    def test_response_data_after_unit_departs(self, new_harness):
+        """Tests that data from a departed unit is no longer returned."""
+        new_harness.begin()
+        rel_id = new_harness.add_relation(RELATION_NAME, "openstack-dashboard")
+        new_harness.add_relation_unit(rel_id, "openstack-dashboard/0")
+        new_harness.add_relation_unit(rel_id, "openstack-dashboard/1")
+        new_harness.update_relation_data(
+            rel_id, "openstack-dashboard/0", TEST_UNIT_DATA
+        )
+        assert new_harness.charm.dashboard.release == TEST_UNIT_DATA["release"]
+
+        new_harness.remove_relation_unit(rel_id, "openstack-dashboard/0")
+        assert new_harness.charm.dashboard.release is None
+
+
+class TestJsonDumps:
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_dumps(self, monkeypatch, use_orjson):
+        """Tests that orjson and the json fallback encode identically."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(dashboard_plugin_requires, "orjson", None)
+        value = {"packages": ["plugin-foo-ui", "café"], "a": 1}
+        assert (
+            dashboard_plugin_requires._json_dumps(value)
+            == '{"a":1,"packages":["plugin-foo-ui","café"]}'
+        )
+
+
+class TestPriority:
+    @pytest.mark.parametrize("priority", [10, "10"])
+    def test_format_priority(self, priority):
+        """Tests that integer priorities are formatted for the databag."""
+        assert dashboard_plugin_requires._format_priority(priority) == "10"
+
+    @pytest.mark.parametrize("priority", [None, ""])
+    def test_format_no_priority(self, priority):
+        """Tests that None and the empty string mean no priority."""
+        assert dashboard_plugin_requires._format_priority(priority) is None
+
+    @pytest.mark.parametrize("priority", [10.7, True, "ten", "10.7"])
+    def test_format_priority_invalid(self, priority):
+        """Tests that non-integer priorities are rejected."""
+        with pytest.raises(ValueError):
+            dashboard_plugin_requires._format_priority(priority)
+
+    def test_invalid_priority_on_init(self, new_harness):
+        """Tests that an invalid priority fails when the plugin is created."""
+        new_harness.begin()
+        with pytest.raises(ValueError):
+            HorizonPlugin(new_harness.charm, "other", priority=10.7)
+
+    def test_empty_priority_not_published(self, new_harness):
+        """Tests that an empty priority is skipped on joined, as before."""
+        new_harness.begin()
+        new_harness.charm.dashboard.priority = ""
+        rel_id = new_harness.add_relation(RELATION_NAME, "openstack-dashboard")
+        new_harness.add_relation_unit(rel_id, "openstack-dashboard/0")
+
+        unit_data = new_harness.get_relation_data(
+            rel_id, new_harness.charm.unit.name
+        )
+        assert "priority" not in unit_data
+        assert "install-packages" in unit_data
@@ -1,8 +1,9 @@
 # Copyright 2022 Canonical Ltd.
 # See LICENSE file for licensing details.
 
-import unittest
+from unittest import mock
 
+import pytest
 from charms.openstack_libs.v0.gnocchi_requires import GnocchiRequires
 from ops.charm import CharmBase
 from ops.testing import Harness
@@ -24,6 +25,7 @@ class ApplicationCharm(CharmBase):
     def __init__(self, *args):
         super().__init__(*args)
         self.metric_service = GnocchiRequires(self, RELATION_NAME)
+        self.ready_count = 0
 
         self.framework.observe(
             self.metric_service.on.connected,
@@ -41,22 +43,25 @@ class ApplicationCharm(CharmBase):
         pass
 
     def _on_metric_service_ready(self, _) -> None:
-        pass
+        self.ready_count += 1
 
     def _on_metric_service_goneaway(self, _) -> None:
         pass
 
 
-class TestGnocchiRequires(unittest.TestCase):
-    def setUp(self):
-        self.harness = Harness(ApplicationCharm, meta=METADATA)
-        self.addCleanup(self.harness.cleanup)
+@pytest.fixture
+def harness():
+    harness = Harness(ApplicationCharm, meta=METADATA)
+    yield harness
+    harness.cleanup()
+
 
-    def test_gnocchi_relation(self):
-        self.rel_id = self.harness.add_relation(RELATION_NAME, "gnocchi")
-        self.harness.add_relation_unit(self.rel_id, "gnocchi/0")
-        self.harness.set_leader(True)
-        self.harness.begin_with_initial_hooks()
+class TestGnocchiRequires:
+    def test_gnocchi_relation(self, harness):
+        rel_id = harness.add_relation(RELATION_NAME, "gnocchi")
+        harness.add_relation_unit(rel_id, "gnocchi/0")
+        harness.set_leader(True)
+        harness.begin_with_initial_hooks()
 
         gnocchi_data = {
             "egress-subnets": "10.0.0.1/32",
@@ -65,13 +70,89 @@ class TestGnocchiRequires(unittest.TestCase):
             "private-address": "10.0.0.1",
         }
 
-        self.harness.update_relation_data(
-            self.rel_id,
+        harness.update_relation_data(
+            rel_id,
             "gnocchi/0",
             gnocchi_data,
         )
 
-        self.assertEqual(
-            gnocchi_data["gnocchi_url"],
-            self.harness.charm.metric_service.gnocchi_url,
+        assert (
+            gnocchi_data["gnocchi_url"]
+            == harness.charm.metric_service.gnocchi_url
+        )
+
+    def test_gnocchi_url_from_later_unit(self, harness):
+        """Data is returned even if only a later unit provides it."""
+        rel_id = harness.add_relation(RELATION_NAME, "gnocchi")
+        harness.add_relation_unit(rel_id, "gnocchi/0")
+        harness.add_relation_unit(rel_id, "gnocchi/1")
+        harness.set_leader(True)
+        harness.begin_with_initial_hooks()
+
+        harness.update_relation_data(
+            rel_id,
+            "gnocchi/1",
+            {"gnocchi_url": "https://10.0.0.2:8041"},
+        )
+
+        # relation.units is a set, so fix the order to make sure the unit
+        # without the data is looked at first.
+        metric_service = harness.charm.metric_service
+        units = tuple(
+            sorted(metric_service._gnocchi_rel.units, key=lambda u: u.name)
+        )
+        with mock.patch.dict(
+            metric_service.__dict__, {"_gnocchi_units": units}
+        ):
+            assert "https://10.0.0.2:8041" == metric_service.gnocchi_url
+
+    def test_ready_requires_url(self, harness):
+        """The ready event does not fire until gnocchi_url is provided."""
+        rel_id = harness.add_relation(RELATION_NAME, "gnocchi")
+        harness.add_relation_unit(rel_id, "gnocchi/0")
+        harness.set_leader(True)
+        harness.begin_with_initial_hooks()
+
+        harness.update_relation_data(rel_id, "gnocchi/0", {"foo": "bar"})
+        assert harness.charm.metric_service.gnocchi_url is None
+        assert harness.charm.ready_count == 0
+
+    def test_ready_emitted_once(self, harness):
+        """The ready event fires once per change and not on departure."""
+        rel_id = harness.add_relation(RELATION_NAME, "gnocchi")
+        harness.add_relation_unit(rel_id, "gnocchi/0")
+        harness.set_leader(True)
+        harness.begin_with_initial_hooks()
+        assert harness.charm.ready_count == 0
+
+        harness.update_relation_data(
+            rel_id,
+            "gnocchi/0",
+            {"gnocchi_url": "https://10.0.0.1:8041"},
+        )
+        assert harness.charm.ready_count == 1
+
+        harness.remove_relation_unit(rel_id, "gnocchi/0")
+        assert harness.charm.ready_count == 1
+
+    def test_gnocchi_url_after_unit_departs(self, harness):
+        """Departed units are no longer used to look up data."""
+        rel_id = harness.add_relation(RELATION_NAME, "gnocchi")
+        harness.add_relation_unit(rel_id, "gnocchi/0")
+        harness.add_relation_unit(rel_id, "gnocchi/1")
+        harness.set_leader(True)
+        harness.begin_with_initial_hooks()
+
+        harness.update_relation_data(
+            rel_id, "gnocchi/0", {"gnocchi_url": "https://10.0.0.1:8041"}
+        )
+        harness.update_relation_data(
+            rel_id, "gnocchi/1", {"gnocchi_url": "https://10.0.0.2:8041"}
+        )
+        # Populate the cached units before one of them departs
+        assert harness.charm.metric_service.gnocchi_url is not None
+
+        harness.remove_relation_unit(rel_id, "gnocchi/0")
+        assert (
+            "https://10.0.0.2:8041" == harness.charm.metric_service.gnocchi_url
         )
@@ -2,8 +2,9 @@
 # See LICENSE file for licensing details.
 
 import json
-import unittest
 
+import pytest
+from charms.openstack_libs.v0 import keystone_requires
 from charms.openstack_libs.v0.keystone_requires import KeystoneRequires
 from ops.charm import CharmBase
 from ops.testing import Harness
@@ -115,64 +116,73 @@ TEST_UNIT_DATA_SERVICE_DATA = {
 }
 
 
-class TestKeystoneRequires(unittest.TestCase):
-    def setUp(self):
-        self.harness = Harness(ApplicationCharm, meta=METADATA)
-        self.addCleanup(self.harness.cleanup)
+@pytest.fixture(scope="class")
+def shared_harness():
+    harness = Harness(ApplicationCharm, meta=METADATA)
+    rel_id = harness.add_relation(RELATION_NAME, "keystone")
+    harness.add_relation_unit(rel_id, "keystone/0")
+    harness.set_leader(True)
+    harness.begin_with_initial_hooks()
+    yield harness
+    harness.cleanup()
+
+
+@pytest.fixture
+def harness(shared_harness):
+    """Yield the class Harness, clearing the remote databags afterwards."""
+    yield shared_harness
+    rel_id = shared_harness.model.get_relation(RELATION_NAME).id
+    for remote in ("keystone", "keystone/0"):
+        data = shared_harness.get_relation_data(rel_id, remote)
+        if data:
+            shared_harness.update_relation_data(
+                rel_id, remote, {key: "" for key in data}
+            )
+
 
-        self.rel_id = self.harness.add_relation(RELATION_NAME, "keystone")
-        self.harness.add_relation_unit(self.rel_id, "keystone/0")
-        self.harness.set_leader(True)
-        self.harness.begin_with_initial_hooks()
+@pytest.fixture
+def rel_id(harness):
+    return harness.model.get_relation(RELATION_NAME).id
 
-    def test_register_services(self):
+
+class TestKeystoneRequires:
+    def test_register_services(self, harness):
         # Forward compatible application scoped presentation
-        app_data = self.harness.charm.model.get_relation(
-            "identity-service"
-        ).data[self.harness.charm.app]
-        self.assertEqual(
-            app_data["service-endpoints"],
-            json.dumps(SERVICE_ENDPOINTS, sort_keys=True),
-        )
-        self.assertEqual(
-            app_data["region"],
-            REGION,
-        )
+        app_data = harness.charm.model.get_relation("identity-service").data[
+            harness.charm.app
+        ]
+        assert json.loads(app_data["service-endpoints"]) == SERVICE_ENDPOINTS
+        assert app_data["region"] == REGION
 
         # Backwards compatible unit scoped presentation
-        unit_data = self.harness.charm.model.get_relation(
-            "identity-service"
-        ).data[self.harness.charm.unit]
-        self.assertEqual(
-            unit_data,
-            {
-                "service": "myservice",
-                "internal_url": "http://myservice:80/internal",
-                "admin_url": "http://myservice:80/admin",
-                "public_url": "http://myservice:80/public",
-                "region": REGION,
-            },
-        )
-
-    def test_forward_compat(self):
+        unit_data = harness.charm.model.get_relation("identity-service").data[
+            harness.charm.unit
+        ]
+        assert unit_data == {
+            "service": "myservice",
+            "internal_url": "http://myservice:80/internal",
+            "admin_url": "http://myservice:80/admin",
+            "public_url": "http://myservice:80/public",
+            "region": REGION,
+        }
+
+    def test_forward_compat(self, harness, rel_id):
         """Check forwards compatibility with application data."""
-        self.harness.update_relation_data(
-            self.rel_id,
+        harness.update_relation_data(
+            rel_id,
             "keystone",
             TEST_APP_DATA_SERVICE_DATA,
         )
         for key, value in TEST_APP_DATA_SERVICE_DATA.items():
-            self.assertEqual(
-                getattr(
-                    self.harness.charm.identity_service, key.replace("-", "_")
-                ),
-                value,
+            assert (
+                getattr(harness.charm.identity_service, key.replace("-", "_"))
+                == value
             )
 
-    def test_backward_compat(self):
+    def test_backward_compat(self, harness, rel_id):
         """Check backwards compatibility with unit data."""
-        self.harness.update_relation_data(
-            self.rel_id,
+        harness.update_relation_data(
+            rel_id,
             "keystone/0",
             TEST_UNIT_DATA_SERVICE_DATA,
         )
@@ -181,37 +191,48 @@ class TestKeystoneRequires(unittest.TestCase):
             new_key,
             old_key,
         ) in KeystoneRequires._backwards_compat_remaps.items():
-            self.assertEqual(
+            assert (
                 getattr(
-                    self.harness.charm.identity_service,
+                    harness.charm.identity_service,
                     new_key.replace("-", "_"),
-                ),
-                TEST_UNIT_DATA_SERVICE_DATA[old_key],
+                )
+                == TEST_UNIT_DATA_SERVICE_DATA[old_key]
             )
         # Keys below are new keystone-k8s presented only so should be None
-        self.assertIsNone(self.harness.charm.identity_service.public_auth_url)
-        self.assertIsNone(
-            self.harness.charm.identity_service.internal_auth_url
-        )
-        self.assertIsNone(self.harness.charm.identity_service.admin_auth_url)
+        assert harness.charm.identity_service.public_auth_url is None
+        assert harness.charm.identity_service.internal_auth_url is None
+        assert harness.charm.identity_service.admin_auth_url is None
 
-    def test_app_data_priority(self):
+    def test_app_data_priority(self, harness, rel_id):
         """Ensure that the app data bag takes priority over unit data."""
-        self.harness.update_relation_data(
-            self.rel_id,
+        harness.update_relation_data(
+            rel_id,
             "keystone",
             TEST_APP_DATA_SERVICE_DATA,
         )
-        self.harness.update_relation_data(
-            self.rel_id,
+        harness.update_relation_data(
+            rel_id,
             "keystone/0",
             TEST_UNIT_DATA_SERVICE_DATA,
         )
 
         for key, value in TEST_APP_DATA_SERVICE_DATA.items():
-            self.assertEqual(
-                getattr(
-                    self.harness.charm.identity_service, key.replace("-", "_")
-                ),
-                value,
+            assert (
+                getattr(harness.charm.identity_service, key.replace("-", "_"))
+                == value
             )
+
+
+class TestJsonDumps:
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_dumps(self, monkeypatch, use_orjson):
+        """Check that orjson and the json fallback encode identically."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(keystone_requires, "orjson", None)
+        value = [{"service_name": "café", "admin_url": "http://x"}]
+        assert (
+            keystone_requires._json_dumps(value)
+            == '[{"admin_url":"http://x","service_name":"café"}]'
+        )
@@ -1,8 +1,7 @@
 # Copyright 2022 Canonical Ltd.
 # See LICENSE file for licensing details.
 
-import unittest
-
+import pytest
 from charms.openstack_libs.v0.rabbitmq_requires import RabbitMQRequires
 from ops.charm import CharmBase
 from ops.testing import Harness
@@ -52,16 +51,19 @@ class ApplicationCharm(CharmBase):
         pass
 
 
-class TestRabbitMQRequires(unittest.TestCase):
-    def setUp(self):
-        self.harness = Harness(ApplicationCharm, meta=METADATA)
-        self.addCleanup(self.harness.cleanup)
+@pytest.fixture
+def harness():
+    harness = Harness(ApplicationCharm, meta=METADATA)
+    yield harness
+    harness.cleanup()
+
 
-    def test_rabbitmq_relation(self):
-        self.rel_id = self.harness.add_relation(RELATION_NAME, "rabbitmq")
-        self.harness.add_relation_unit(self.rel_id, "rabbitmq/0")
-        self.harness.set_leader(True)
-        self.harness.begin_with_initial_hooks()
+class TestRabbitMQRequires:
+    def test_rabbitmq_relation(self, harness):
+        rel_id = harness.add_relation(RELATION_NAME, "rabbitmq")
+        harness.add_relation_unit(rel_id, "rabbitmq/0")
+        harness.set_leader(True)
+        harness.begin_with_initial_hooks()
 
         rabbitmq_data = {
             "username": "test",
@@ -73,18 +75,11 @@ class TestRabbitMQRequires(unittest.TestCase):
             "private-address": "10.0.0.1",
         }
 
-        self.harness.update_relation_data(
-            self.rel_id,
+        harness.update_relation_data(
+            rel_id,
             "rabbitmq/0",
             rabbitmq_data,
         )
 
-        self.assertEqual(
-            rabbitmq_data["hostname"],
-            self.harness.charm.rabbitmq.hostname,
-        )
-
-        self.assertEqual(
-            rabbitmq_data["password"],
-            self.harness.charm.rabbitmq.password,
-        )
+        assert rabbitmq_data["hostname"] == harness.charm.rabbitmq.hostname
+        assert rabbitmq_data["password"] == harness.charm.rabbitmq.password